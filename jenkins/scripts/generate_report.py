@@ -5,14 +5,61 @@ Generates professional PDF reports with complete findings, charts, and visual el
 With smart auto-detection of project metadata
 """
 import json
+import hashlib
 import subprocess
 import sys
 import os
+import shlex
 import argparse
 from datetime import datetime
+from collections import Counter
+from contextlib import redirect_stderr
+from functools import lru_cache
+from multiprocessing import Pool, cpu_count
 from html import escape as html_escape
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+# ============================================================================
+# JSON HELPERS
+# ============================================================================
+
+def load_json_file(path):
+    """Load a JSON file, using orjson on raw bytes when available"""
+    if orjson is not None:
+        with open(path, 'rb') as f:
+            return orjson.loads(f.read())
+    with open(path, 'r') as f:
+        return json.load(f)
+
+
+def dump_json_file(path, data):
+    """Write data as indented JSON, using orjson when available"""
+    if orjson is not None:
+        Path(path).write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+    else:
+        Path(path).write_text(json.dumps(data, indent=2))
+
+
+def iter_json_items(path, prefix):
+    """Yield items of a top-level JSON array, streaming with ijson when available"""
+    if ijson is not None:
+        with open(path, 'rb') as f:
+            yield from ijson.items(f, prefix)
+        return
+    data = load_json_file(path)
+    yield from data.get(prefix.split('.', 1)[0]) or []
+
+
 # ============================================================================
 # AUTO-DETECTION FUNCTIONS
 # ============================================================================
@@ -169,6 +216,8 @@ def get_metadata(args):
     """
     print('\n🔍 Collecting metadata...')
 
+    # Single timestamp so document number and scan date always agree
+    now = datetime.now()
     metadata = {}
 
     # Project Name
@@ -227,23 +276,56 @@ def get_metadata(args):
     print(f'✓ Build Number: {build_num}')
 
     # Document Number (auto-generated)
-    date_str = datetime.now().strftime('%Y%m%d')
+    date_str = now.strftime('%Y%m%d')
     metadata['document_number'] = f'TTS-SEC-{date_str}-B{str(build_num).zfill(3)}'
     print(f'✓ Document Number: {metadata["document_number"]}')
 
     # Scan Date
-    metadata['scan_date'] = args.scan_date or datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    metadata['scan_date'] = args.scan_date or now.strftime('%Y-%m-%d %H:%M:%S')
     print(f'✓ Scan Date: {metadata["scan_date"]}')
 
     print('✅ Metadata collection complete\n')
     return metadata
 
 
+# ============================================================================
+# RISK SCORING
+# ============================================================================
+
+# Risk levels, highest first: (minimum score, level, color)
+RISK_LEVELS = (
+    (7, 'CRITICAL', '#d32f2f'),
+    (5, 'HIGH', '#f57c00'),
+    (3, 'MEDIUM', '#fbc02d'),
+    (0, 'LOW', '#388e3c')
+)
+
+
+def risk_score_value(critical, high, medium):
+    """Weighted risk score on a 0-10 scale"""
+    return min(10.0, (critical * 4 + high * 2 + medium) / 10.0)
+
+
+def calculate_risk_score(stats):
+    """
+    Calculate overall risk from severity counts.
+    Returns (score, level, color) where color is a hex string.
+    """
+    if stats['total'] > 0:
+        score = risk_score_value(stats['critical'], stats['high'], stats['medium'])
+    else:
+        score = 0.0
+
+    for threshold, level, color in RISK_LEVELS:
+        if score >= threshold:
+            return score, level, color
+
+
 # ============================================================================
 # ARGUMENT PARSING
 # ============================================================================
 
-def parse_arguments():
+def parse_arguments(argv=None):
     """Parse command-line arguments"""
     parser = argparse.ArgumentParser(
         description='Security Assessment Report Generator with Auto-Detection',
@@ -263,6 +345,9 @@ Examples:
   %(prog)s --input-dir ./security-reports --output-pdf report.pdf \\
     --project-name "My Project" --git-url "https://github.com/company/repo" \\
     --git-branch "main" --developer "John Doe" --build-number "42"
+
+  # Batch mode: one line of the arguments above per report, built in parallel
+  %(prog)s --batch reports.txt
         """
     )
 
@@ -291,32 +376,16 @@ Examples:
                        help='Build number (from BUILD_NUMBER env or "000")')
     parser.add_argument('--scan-date', default=None,
                        help='Scan date (default: current timestamp)')
+    parser.add_argument('--force', action='store_true',
+                       help='Regenerate the PDF even if scan results and metadata are unchanged')
 
-    return parser.parse_args()
+    return parser.parse_args(argv)
 
 
 # ============================================================================
-# MAIN EXECUTION
+# REPORTLAB SETUP
 # ============================================================================
 
-# Parse arguments
-args = parse_arguments()
-
-# Get metadata
-metadata = get_metadata(args)
-
-# Use metadata in variables (for backward compatibility with existing code)
-PROJECT_NAME = metadata['project_name']
-DOCUMENT_NUMBER = metadata['document_number']
-DEVELOPER_NAME = metadata['developer']
-DEVOPS_ENGINEER = metadata['devops_engineer']
-CONTACT_EMAIL = metadata['contact_email']
-GIT_URL = metadata['git_url']
-GIT_BRANCH = metadata['git_branch']
-
-print(f'Project: {PROJECT_NAME}')
-print(f'Document: {DOCUMENT_NUMBER}\n')
-
 # Install required packages
 def install_package(package):
     try:
@@ -331,244 +400,292 @@ def install_package(package):
             print(f'Failed to install {package}, using basic PDF generation')
             return False
 
-has_reportlab = install_package('reportlab')
 
-if has_reportlab:
+@lru_cache(maxsize=None)
+def static_table_styles():
+    """Build the fixed table styles once and share them between reports"""
     from reportlab.lib import colors
-    from reportlab.lib.pagesizes import letter, A4
-    from reportlab.platypus import (SimpleDocTemplate, Table, TableStyle, Paragraph,
-                                    Spacer, PageBreak, Image as RLImage, KeepTogether)
-    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-    from reportlab.lib.units import inch, cm
-    from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_RIGHT, TA_JUSTIFY
-    from reportlab.pdfgen import canvas
-    from reportlab.graphics.shapes import Drawing, Rect, String
-    from reportlab.graphics.charts.piecharts import Pie
-    from reportlab.graphics.charts.barcharts import VerticalBarChart
-    from reportlab.graphics import renderPDF
     from reportlab.lib.colors import HexColor
+    from reportlab.platypus import TableStyle
 
-print('Processing scan results...')
-
-# Change to input directory to read JSON files
-original_dir = os.getcwd()
-os.chdir(args.input_dir)
-
-# Initialize statistics
-issues_found = []
-stats = {
-    'critical': 0,
-    'high': 0,
-    'medium': 0,
-    'low': 0,
-    'info': 0,
-    'total': 0
-}
+    return {
+        'cover': TableStyle([
+            ('BACKGROUND', (0, 0), (0, -1), HexColor('#1e3a5f')),
+            ('BACKGROUND', (1, 0), (1, -1), HexColor('#f5f5f5')),
+            ('TEXTCOLOR', (0, 0), (0, -1), colors.white),
+            ('TEXTCOLOR', (1, 0), (1, -1), HexColor('#212121')),
+            ('ALIGN', (0, 0), (0, -1), 'RIGHT'),
+            ('ALIGN', (1, 0), (1, -1), 'LEFT'),
+            ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
+            ('FONTNAME', (1, 0), (1, -1), 'Helvetica'),
+            ('FONTSIZE', (0, 0), (-1, -1), 10),
+            ('TOPPADDING', (0, 0), (-1, -1), 8),
+            ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
+            ('LEFTPADDING', (0, 0), (-1, -1), 10),
+            ('RIGHTPADDING', (0, 0), (-1, -1), 10),
+            ('GRID', (0, 0), (-1, -1), 1, colors.grey),
+            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE')
+        ]),
+        'summary': TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), HexColor('#1e3a5f')),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
+            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, 0), 11),
+            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+            ('TOPPADDING', (0, 0), (-1, 0), 12),
+            ('BACKGROUND', (0, 1), (-1, 1), HexColor('#ffebee')),
+            ('BACKGROUND', (0, 2), (-1, 2), HexColor('#fff3e0')),
+            ('BACKGROUND', (0, 3), (-1, 3), HexColor('#fffde7')),
+            ('BACKGROUND', (0, 4), (-1, 4), HexColor('#e3f2fd')),
+            ('BACKGROUND', (0, 5), (-1, 5), HexColor('#f5f5f5')),
+            ('BACKGROUND', (0, 6), (-1, 6), HexColor('#e0e0e0')),
+            ('FONTNAME', (0, 6), (-1, 6), 'Helvetica-Bold'),
+            ('GRID', (0, 0), (-1, -1), 1, colors.grey),
+            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE')
+        ]),
+        'issue': TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), HexColor('#424242')),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
+            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+            ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, 0), 8),
+            ('BOTTOMPADDING', (0, 0), (-1, -1), 5),
+            ('TOPPADDING', (0, 0), (-1, -1), 5),
+            ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+            ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, HexColor('#f5f5f5')])
+        ]),
+        'recommendation': TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), HexColor('#e3f2fd')),
+            ('BACKGROUND', (0, 1), (-1, 1), colors.white),
+            ('BOX', (0, 0), (-1, -1), 1, HexColor('#1976d2')),
+            ('TOPPADDING', (0, 0), (-1, -1), 10),
+            ('BOTTOMPADDING', (0, 0), (-1, -1), 10),
+            ('LEFTPADDING', (0, 0), (-1, -1), 10),
+            ('RIGHTPADDING', (0, 0), (-1, -1), 10)
+        ])
+    }
 
-# Tool-specific counters
-tool_stats = {
-    'Semgrep': {'critical': 0, 'high': 0, 'medium': 0, 'low': 0, 'info': 0, 'total': 0},
-    'Trivy': {'critical': 0, 'high': 0, 'medium': 0, 'low': 0, 'info': 0, 'total': 0},
-    'TruffleHog': {'critical': 0, 'high': 0, 'medium': 0, 'low': 0, 'info': 0, 'total': 0}
+
+# ============================================================================
+# SCAN RESULT PROCESSING
+# ============================================================================
+
+# Semgrep reports ERROR/WARNING/INFO, map onto the report severities
+SEMGREP_SEVERITY = {'ERROR': 'HIGH', 'WARNING': 'MEDIUM'}
+
+# Report severity -> statistics key
+SEVERITY_BUCKETS = {
+    'CRITICAL': 'critical',
+    'HIGH': 'high',
+    'MEDIUM': 'medium',
+    'LOW': 'low',
+    'INFO': 'info'
 }
 
-# Process Semgrep results
-print('Processing Semgrep results...')
-try:
-    if os.path.exists('semgrep.json'):
-        with open('semgrep.json', 'r') as f:
-            semgrep_data = json.load(f)
-            results = semgrep_data.get('results', [])
-
-            for result in results:
-                severity = result.get('extra', {}).get('severity', 'INFO').upper()
-                if severity == 'ERROR':
-                    severity = 'HIGH'
-                elif severity == 'WARNING':
-                    severity = 'MEDIUM'
-
-                issue = {
-                    'tool': 'Semgrep',
-                    'type': 'Code Security',
-                    'severity': severity,
-                    'file': result.get('path', 'Unknown')[:80],
-                    'line': result.get('start', {}).get('line', 0),
-                    'title': result.get('check_id', 'Unknown'),
-                    'details': result.get('extra', {}).get('message', 'No description')[:200]
-                }
-                issues_found.append(issue)
 
-                sev_lower = severity.lower()
-                if sev_lower in stats:
-                    stats[sev_lower] += 1
-                    tool_stats['Semgrep'][sev_lower] += 1
-                stats['total'] += 1
-                tool_stats['Semgrep']['total'] += 1
+class Finding:
+    """A single normalised finding; slots keep large result sets compact"""
+    __slots__ = ('tool', 'type', 'severity', 'file', 'line', 'title', 'details')
 
-            print(f'  Found {len(results)} Semgrep issues')
-except Exception as e:
-    print(f'  Semgrep processing error: {e}')
+    def __init__(self, tool, type, severity, file, line, title, details):
+        self.tool = tool
+        self.type = type
+        self.severity = severity
+        self.file = file
+        self.line = line
+        self.title = title
+        self.details = details
 
-# Process Trivy results
-print('Processing Trivy results...')
-trivy_count = 0
-try:
-    if os.path.exists('trivy.json'):
-        with open('trivy.json', 'r') as f:
-            trivy_data = json.load(f)
-
-            for result in trivy_data.get('Results', []):
-                # Process vulnerabilities
-                for vuln in result.get('Vulnerabilities', []):
-                    severity = vuln.get('Severity', 'UNKNOWN').upper()
-
-                    issue = {
-                        'tool': 'Trivy',
-                        'type': 'Vulnerability',
-                        'severity': severity,
-                        'file': result.get('Target', 'Unknown')[:80],
-                        'line': 0,
-                        'title': '{} - {}'.format(vuln.get('PkgName', 'Unknown'), vuln.get('VulnerabilityID', '')),
-                        'details': 'Version: {} | Fix: {}'.format(
-                            vuln.get('InstalledVersion', '?'),
-                            vuln.get('FixedVersion', 'No fix available')
-                        )
-                    }
-                    issues_found.append(issue)
-
-                    sev_lower = severity.lower()
-                    if sev_lower in stats:
-                        stats[sev_lower] += 1
-                        tool_stats['Trivy'][sev_lower] += 1
-                    stats['total'] += 1
-                    tool_stats['Trivy']['total'] += 1
-                    trivy_count += 1
-
-                # Process misconfigurations
-                for misconfig in result.get('Misconfigurations', []):
-                    severity = misconfig.get('Severity', 'UNKNOWN').upper()
-
-                    issue = {
-                        'tool': 'Trivy',
-                        'type': 'Misconfiguration',
-                        'severity': severity,
-                        'file': result.get('Target', 'Unknown')[:80],
-                        'line': misconfig.get('CauseMetadata', {}).get('StartLine', 0),
-                        'title': '{} - {}'.format(misconfig.get('ID', 'Unknown'), misconfig.get('Title', '')),
-                        'details': misconfig.get('Description', 'No description')[:200]
-                    }
-                    issues_found.append(issue)
-
-                    sev_lower = severity.lower()
-                    if sev_lower in stats:
-                        stats[sev_lower] += 1
-                        tool_stats['Trivy'][sev_lower] += 1
-                    stats['total'] += 1
-                    tool_stats['Trivy']['total'] += 1
-                    trivy_count += 1
-
-                # Process secrets
-                for secret in result.get('Secrets', []):
-                    severity = secret.get('Severity', 'HIGH').upper()
-
-                    issue = {
-                        'tool': 'Trivy',
-                        'type': 'Secret',
-                        'severity': severity,
-                        'file': result.get('Target', 'Unknown')[:80],
-                        'line': secret.get('StartLine', 0),
-                        'title': secret.get('Title', 'Secret detected'),
-                        'details': secret.get('RuleID', 'Secret found - hidden for security')
-                    }
-                    issues_found.append(issue)
-
-                    sev_lower = severity.lower()
-                    if sev_lower in stats:
-                        stats[sev_lower] += 1
-                        tool_stats['Trivy'][sev_lower] += 1
-                    stats['total'] += 1
-                    tool_stats['Trivy']['total'] += 1
-                    trivy_count += 1
-
-            print(f'  Found {trivy_count} Trivy issues')
-except Exception as e:
-    print(f'  Trivy processing error: {e}')
-
-# Process TruffleHog results
-print('Processing TruffleHog results...')
-try:
-    if os.path.exists('trufflehog.json'):
-        with open('trufflehog.json', 'r') as f:
-            trufflehog_data = json.load(f)
-
-            for secret in trufflehog_data.get('secrets', []):
-                source = secret.get('SourceMetadata', {}).get('Data', {}).get('Filesystem', {})
-
-                issue = {
-                    'tool': 'TruffleHog',
-                    'type': 'Secret',
-                    'severity': 'CRITICAL',
-                    'file': source.get('file', 'Unknown')[:80],
-                    'line': source.get('line', 0),
-                    'title': secret.get('DetectorName', 'Secret detected'),
-                    'details': 'Verified: {}'.format(secret.get('Verified', False))
-                }
+
+def collect_findings(input_dir):
+    """Parse Semgrep, Trivy and TruffleHog results into issues and statistics"""
+    print('Processing scan results...')
+
+    input_path = Path(input_dir)
+
+    issues_found = []
+
+    # Tool-specific counters, merged into the overall statistics at the end
+    tool_stats = {'Semgrep': Counter(), 'Trivy': Counter(), 'TruffleHog': Counter()}
+
+    # Process Semgrep results
+    print('Processing Semgrep results...')
+    try:
+        semgrep_count = 0
+        for result in iter_json_items(input_path / 'semgrep.json', 'results.item'):
+            severity = result.get('extra', {}).get('severity', 'INFO').upper()
+            severity = SEMGREP_SEVERITY.get(severity, severity)
+
+            issue = Finding(
+                tool='Semgrep',
+                type='Code Security',
+                severity=severity,
+                file=result.get('path', 'Unknown')[:80],
+                line=result.get('start', {}).get('line', 0),
+                title=result.get('check_id', 'Unknown'),
+                details=result.get('extra', {}).get('message', 'No description')[:200]
+            )
+            issues_found.append(issue)
+
+            bucket = SEVERITY_BUCKETS.get(severity)
+            if bucket:
+                tool_stats['Semgrep'][bucket] += 1
+            tool_stats['Semgrep']['total'] += 1
+            semgrep_count += 1
+
+        print(f'  Found {semgrep_count} Semgrep issues')
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        print(f'  Semgrep processing error: {e}')
+
+    # Process Trivy results
+    print('Processing Trivy results...')
+    trivy_count = 0
+    try:
+        for result in iter_json_items(input_path / 'trivy.json', 'Results.item'):
+            # Process vulnerabilities
+            for vuln in result.get('Vulnerabilities') or []:
+                severity = vuln.get('Severity', 'UNKNOWN').upper()
+
+                issue = Finding(
+                    tool='Trivy',
+                    type='Vulnerability',
+                    severity=severity,
+                    file=result.get('Target', 'Unknown')[:80],
+                    line=0,
+                    title='{} - {}'.format(vuln.get('PkgName', 'Unknown'), vuln.get('VulnerabilityID', '')),
+                    details='Version: {} | Fix: {}'.format(
+                        vuln.get('InstalledVersion', '?'),
+                        vuln.get('FixedVersion', 'No fix available')
+                    )
+                )
+                issues_found.append(issue)
+
+                bucket = SEVERITY_BUCKETS.get(severity)
+                if bucket:
+                    tool_stats['Trivy'][bucket] += 1
+                tool_stats['Trivy']['total'] += 1
+                trivy_count += 1
+
+            # Process misconfigurations
+            for misconfig in result.get('Misconfigurations') or []:
+                severity = misconfig.get('Severity', 'UNKNOWN').upper()
+
+                issue = Finding(
+                    tool='Trivy',
+                    type='Misconfiguration',
+                    severity=severity,
+                    file=result.get('Target', 'Unknown')[:80],
+                    line=misconfig.get('CauseMetadata', {}).get('StartLine', 0),
+                    title='{} - {}'.format(misconfig.get('ID', 'Unknown'), misconfig.get('Title', '')),
+                    details=misconfig.get('Description', 'No description')[:200]
+                )
                 issues_found.append(issue)
-                stats['critical'] += 1
-                tool_stats['TruffleHog']['critical'] += 1
-                stats['total'] += 1
-                tool_stats['TruffleHog']['total'] += 1
-
-            print(f'  Found {len(trufflehog_data.get("secrets", []))} TruffleHog secrets')
-except Exception as e:
-    print(f'  TruffleHog processing error: {e}')
-
-# Sort issues by severity
-severity_order = {'CRITICAL': 0, 'HIGH': 1, 'MEDIUM': 2, 'LOW': 3, 'INFO': 4}
-issues_found.sort(key=lambda x: (severity_order.get(x['severity'], 5), x['tool'], x['file']))
-
-# Calculate risk score
-if stats['total'] > 0:
-    risk_score = min(10.0, (stats['critical'] * 4 + stats['high'] * 2 + stats['medium'] * 1) / 10.0)
-else:
-    risk_score = 0.0
-
-# Determine risk level
-if risk_score >= 7:
-    risk_level = 'CRITICAL'
-    risk_color = HexColor('#d32f2f')
-elif risk_score >= 5:
-    risk_level = 'HIGH'
-    risk_color = HexColor('#f57c00')
-elif risk_score >= 3:
-    risk_level = 'MEDIUM'
-    risk_color = HexColor('#fbc02d')
-else:
-    risk_level = 'LOW'
-    risk_color = HexColor('#388e3c')
-
-print('\nSummary:')
-print('  Total issues: {}'.format(stats['total']))
-print('  Critical: {}'.format(stats['critical']))
-print('  High: {}'.format(stats['high']))
-print('  Medium: {}'.format(stats['medium']))
-print('  Low: {}'.format(stats['low']))
-print('  Info: {}'.format(stats['info']))
-print('  Risk Level: {} ({:.1f}/10)'.format(risk_level, risk_score))
+
+                bucket = SEVERITY_BUCKETS.get(severity)
+                if bucket:
+                    tool_stats['Trivy'][bucket] += 1
+                tool_stats['Trivy']['total'] += 1
+                trivy_count += 1
+
+            # Process secrets
+            for secret in result.get('Secrets') or []:
+                severity = secret.get('Severity', 'HIGH').upper()
+
+                issue = Finding(
+                    tool='Trivy',
+                    type='Secret',
+                    severity=severity,
+                    file=result.get('Target', 'Unknown')[:80],
+                    line=secret.get('StartLine', 0),
+                    title=secret.get('Title', 'Secret detected'),
+                    details=secret.get('RuleID', 'Secret found - hidden for security')
+                )
+                issues_found.append(issue)
+
+                bucket = SEVERITY_BUCKETS.get(severity)
+                if bucket:
+                    tool_stats['Trivy'][bucket] += 1
+                tool_stats['Trivy']['total'] += 1
+                trivy_count += 1
+
+        print(f'  Found {trivy_count} Trivy issues')
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        print(f'  Trivy processing error: {e}')
+
+    # Process TruffleHog results
+    print('Processing TruffleHog results...')
+    try:
+        trufflehog_count = 0
+        for secret in iter_json_items(input_path / 'trufflehog.json', 'secrets.item'):
+            source = secret.get('SourceMetadata', {}).get('Data', {}).get('Filesystem', {})
+
+            issue = Finding(
+                tool='TruffleHog',
+                type='Secret',
+                severity='CRITICAL',
+                file=source.get('file', 'Unknown')[:80],
+                line=source.get('line', 0),
+                title=secret.get('DetectorName', 'Secret detected'),
+                details='Verified: {}'.format(secret.get('Verified', False))
+            )
+            issues_found.append(issue)
+            tool_stats['TruffleHog']['critical'] += 1
+            tool_stats['TruffleHog']['total'] += 1
+            trufflehog_count += 1
+
+        print(f'  Found {trufflehog_count} TruffleHog secrets')
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        print(f'  TruffleHog processing error: {e}')
+
+    stats = Counter()
+    for counts in tool_stats.values():
+        stats.update(counts)
+
+    # Sort issues by severity
+    severity_order = {'CRITICAL': 0, 'HIGH': 1, 'MEDIUM': 2, 'LOW': 3, 'INFO': 4}
+    issues_found.sort(key=lambda x: (severity_order.get(x.severity, 5), x.tool, x.file))
+
+    return issues_found, stats, tool_stats
+
 
 # ============================================================================
 # GENERATE PDF REPORT
 # ============================================================================
-print('\nGenerating comprehensive PDF report...')
 
-# Change back to original directory for output
-os.chdir(original_dir)
+def generate_pdf(output_pdf_path, metadata, issues_found, stats, tool_stats, risk):
+    """Build the PDF report, returns True on success"""
+    if not install_package('reportlab'):
+        print('  ❌ ReportLab not available, cannot generate PDF')
+        return False
+
+    # Imported here so --help and argument errors don't pay for reportlab
+    from reportlab.lib import colors
+    from reportlab.lib.pagesizes import A4
+    from reportlab.platypus import (SimpleDocTemplate, Table, TableStyle, Paragraph,
+                                    Spacer, PageBreak, Image as RLImage)
+    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+    from reportlab.lib.units import inch, cm
+    from reportlab.lib.enums import TA_CENTER, TA_JUSTIFY
+    from reportlab.pdfgen import canvas
+    from reportlab.graphics.shapes import Drawing
+    from reportlab.graphics.charts.piecharts import Pie
+    from reportlab.graphics.charts.barcharts import VerticalBarChart
+    from reportlab.lib.colors import HexColor
+
+    table_styles = static_table_styles()
 
-# Get absolute output path
-output_pdf_path = Path(args.output_pdf).resolve()
-output_pdf_path.parent.mkdir(parents=True, exist_ok=True)
+    project_name = metadata['project_name']
+    document_number = metadata['document_number']
+    risk_score, risk_level, risk_color = risk
 
-if has_reportlab:
     try:
         # Define severity colors
         SEVERITY_COLORS = {
@@ -579,6 +696,11 @@ if has_reportlab:
             'INFO': HexColor('#757575')
         }
 
+        # Header/footer text is the same on every page, format it once
+        footer_left = "INTERNAL USE ONLY | Doc: {}".format(document_number)
+        header_right = project_name[:40]
+        header_color = HexColor('#1e3a5f')
+
         # Custom page template with header and footer
         class NumberedCanvas(canvas.Canvas):
             def __init__(self, *args, **kwargs):
@@ -598,29 +720,30 @@ if has_reportlab:
                 canvas.Canvas.save(self)
 
             def draw_page_number(self, page_count):
-                # Footer with page number and document number (skip first page)
-                if self._pageNumber > 1:
-                    self.setFont("Helvetica", 8)
-                    self.setFillColor(colors.grey)
-
-                    # Left side: Confidential + Document Number
-                    footer_left = "INTERNAL USE ONLY | Doc: {}".format(DOCUMENT_NUMBER)
-                    self.drawString(1*cm, 1*cm, footer_left)
-
-                    # Right side: Page numbers
-                    page = "Page {} of {}".format(self._pageNumber, page_count)
-                    self.drawRightString(A4[0] - 1*cm, 1*cm, page)
-
-                # Header (skip first page)
-                if self._pageNumber > 1:
-                    self.setFont("Helvetica-Bold", 10)
-                    self.setFillColor(HexColor('#1e3a5f'))
-                    self.drawString(1*cm, A4[1] - 1.5*cm, "TTS Security Assessment Report")
-                    self.drawRightString(A4[0] - 1*cm, A4[1] - 1.5*cm, PROJECT_NAME[:40])
-                    # Horizontal line
-                    self.setStrokeColor(colors.grey)
-                    self.setLineWidth(0.5)
-                    self.line(1*cm, A4[1] - 1.7*cm, A4[0] - 1*cm, A4[1] - 1.7*cm)
+                # Header and footer are skipped on the cover page
+                if self._pageNumber == 1:
+                    return
+
+                # Footer with page number and document number
+                self.setFont("Helvetica", 8)
+                self.setFillColor(colors.grey)
+
+                # Left side: Confidential + Document Number
+                self.drawString(1*cm, 1*cm, footer_left)
+
+                # Right side: Page numbers
+                page = "Page {} of {}".format(self._pageNumber, page_count)
+                self.drawRightString(A4[0] - 1*cm, 1*cm, page)
+
+                # Header
+                self.setFont("Helvetica-Bold", 10)
+                self.setFillColor(header_color)
+                self.drawString(1*cm, A4[1] - 1.5*cm, "TTS Security Assessment Report")
+                self.drawRightString(A4[0] - 1*cm, A4[1] - 1.5*cm, header_right)
+                # Horizontal line
+                self.setStrokeColor(colors.grey)
+                self.setLineWidth(0.5)
+                self.line(1*cm, A4[1] - 1.7*cm, A4[0] - 1*cm, A4[1] - 1.7*cm)
 
         # Create PDF document
         doc = SimpleDocTemplate(str(output_pdf_path), pagesize=A4,
@@ -688,20 +811,6 @@ if has_reportlab:
             spaceAfter=10
         )
 
-        # ==================== COVER PAGE ====================
-        # Add TTS company logo
-        logo_path = '/usr/local/bin/security-scripts/logo.png'
-        if os.path.exists(logo_path):
-            try:
-                logo = RLImage(logo_path, width=4*inch, height=0.8*inch, kind='proportional')
-                story.append(logo)
-                story.append(Spacer(1, 0.2*inch))
-            except Exception as e:
-                print(f'  Warning: Could not load logo: {e}')
-        else:
-            print(f'  Warning: Logo not found at {logo_path}')
-
-        # Company tagline
         tagline_style = ParagraphStyle(
             'Tagline',
             parent=styles['Normal'],
@@ -710,14 +819,7 @@ if has_reportlab:
             alignment=TA_CENTER,
             spaceAfter=20
         )
-        story.append(Paragraph('When No One Has the Answers™', tagline_style))
-        story.append(Spacer(1, 0.5*inch))
-
-        # Main title
-        story.append(Paragraph('TTS SECURITY ASSESSMENT REPORT', title_style))
-        story.append(Spacer(1, 0.1*inch))
 
-        # Subtitle
         subtitle2_style = ParagraphStyle(
             'Subtitle2',
             parent=styles['Normal'],
@@ -726,45 +828,7 @@ if has_reportlab:
             alignment=TA_CENTER,
             spaceAfter=30
         )
-        story.append(Paragraph('Comprehensive Security Scan Analysis', subtitle2_style))
-        story.append(Spacer(1, 0.3*inch))
-
-        # Document details table
-        doc_data = [
-            ['Document Number:', DOCUMENT_NUMBER],
-            ['Project Name:', html_escape(PROJECT_NAME)],
-            ['Scan Date:', metadata['scan_date']],
-            ['Jenkins Build:', '#{}'.format(metadata['build_number'])],
-            ['Git Repository:', html_escape(GIT_URL[:60])],
-            ['Git Branch:', html_escape(GIT_BRANCH)],
-            ['Contact Email:', CONTACT_EMAIL],
-            ['Developer:', html_escape(DEVELOPER_NAME)],
-            ['DevOps Engineer:', html_escape(DEVOPS_ENGINEER)],
-            ['Total Findings:', str(stats['total'])]
-        ]
-
-        doc_table = Table(doc_data, colWidths=[4*cm, 11*cm])
-        doc_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (0, -1), HexColor('#1e3a5f')),
-            ('BACKGROUND', (1, 0), (1, -1), HexColor('#f5f5f5')),
-            ('TEXTCOLOR', (0, 0), (0, -1), colors.white),
-            ('TEXTCOLOR', (1, 0), (1, -1), HexColor('#212121')),
-            ('ALIGN', (0, 0), (0, -1), 'RIGHT'),
-            ('ALIGN', (1, 0), (1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
-            ('FONTNAME', (1, 0), (1, -1), 'Helvetica'),
-            ('FONTSIZE', (0, 0), (-1, -1), 10),
-            ('TOPPADDING', (0, 0), (-1, -1), 8),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
-            ('LEFTPADDING', (0, 0), (-1, -1), 10),
-            ('RIGHTPADDING', (0, 0), (-1, -1), 10),
-            ('GRID', (0, 0), (-1, -1), 1, colors.grey),
-            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE')
-        ]))
-        story.append(doc_table)
-        story.append(Spacer(1, 0.4*inch))
 
-        # Risk level banner
         risk_banner_style = ParagraphStyle(
             'RiskBanner',
             parent=styles['Normal'],
@@ -775,87 +839,140 @@ if has_reportlab:
             fontName='Helvetica-Bold'
         )
 
+        confidential_style = ParagraphStyle(
+            'Confidential',
+            parent=styles['Normal'],
+            fontSize=11,
+            textColor=HexColor('#d32f2f'),
+            alignment=TA_CENTER,
+            fontName='Helvetica-Bold'
+        )
+
+        # Detail table cells carry their font size on the style, so cell
+        # text is plain escaped text with no inline markup to parse
+        cell_style = ParagraphStyle(
+            'Cell',
+            parent=body_style,
+            fontSize=7
+        )
+
+        cell_bold_style = ParagraphStyle(
+            'CellBold',
+            parent=cell_style,
+            fontName='Helvetica-Bold'
+        )
+
+        # ==================== COVER PAGE ====================
+        # Add TTS company logo
+        logo_path = '/usr/local/bin/security-scripts/logo.png'
+        if os.path.exists(logo_path):
+            try:
+                logo = RLImage(logo_path, width=4*inch, height=0.8*inch, kind='proportional')
+                story.extend([
+                    logo,
+                    Spacer(1, 0.2*inch)
+                ])
+            except Exception as e:
+                print(f'  Warning: Could not load logo: {e}')
+        else:
+            print(f'  Warning: Logo not found at {logo_path}')
+
+        story.extend([
+            # Company tagline
+            Paragraph('When No One Has the Answers™', tagline_style),
+            Spacer(1, 0.5*inch),
+            # Main title
+            Paragraph('TTS SECURITY ASSESSMENT REPORT', title_style),
+            Spacer(1, 0.1*inch),
+            # Subtitle
+            Paragraph('Comprehensive Security Scan Analysis', subtitle2_style),
+            Spacer(1, 0.3*inch)
+        ])
+
+        # Document details table
+        doc_data = [
+            ['Document Number:', document_number],
+            ['Project Name:', html_escape(project_name)],
+            ['Scan Date:', metadata['scan_date']],
+            ['Jenkins Build:', '#{}'.format(metadata['build_number'])],
+            ['Git Repository:', html_escape(metadata['git_url'][:60])],
+            ['Git Branch:', html_escape(metadata['git_branch'])],
+            ['Contact Email:', metadata['contact_email']],
+            ['Developer:', html_escape(metadata['developer'])],
+            ['DevOps Engineer:', html_escape(metadata['devops_engineer'])],
+            ['Total Findings:', str(stats['total'])]
+        ]
+
+        doc_table = Table(doc_data, colWidths=[4*cm, 11*cm])
+        doc_table.setStyle(table_styles['cover'])
+        story.extend([
+            doc_table,
+            Spacer(1, 0.4*inch)
+        ])
+
+        # Risk level banner
         risk_banner_table = Table(
             [[Paragraph('OVERALL RISK LEVEL: {} ({:.1f}/10)'.format(risk_level, risk_score), risk_banner_style)]],
             colWidths=[15*cm]
         )
         risk_banner_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, -1), risk_color),
+            ('BACKGROUND', (0, 0), (-1, -1), HexColor(risk_color)),
             ('TOPPADDING', (0, 0), (-1, -1), 15),
             ('BOTTOMPADDING', (0, 0), (-1, -1), 15),
             ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
             ('VALIGN', (0, 0), (-1, -1), 'MIDDLE')
         ]))
-        story.append(risk_banner_table)
-        story.append(Spacer(1, 0.5*inch))
+        story.extend([
+            risk_banner_table,
+            Spacer(1, 0.5*inch)
+        ])
 
         # Confidentiality notice
-        confidential_style = ParagraphStyle(
-            'Confidential',
-            parent=styles['Normal'],
-            fontSize=11,
-            textColor=HexColor('#d32f2f'),
-            alignment=TA_CENTER,
-            fontName='Helvetica-Bold'
-        )
-        story.append(Paragraph('INTERNAL USE ONLY', confidential_style))
-
-        story.append(PageBreak())
+        story.extend([
+            Paragraph('INTERNAL USE ONLY', confidential_style),
+            PageBreak()
+        ])
 
         # ==================== EXECUTIVE SUMMARY ====================
-        story.append(Paragraph('EXECUTIVE SUMMARY', heading1_style))
-        story.append(Spacer(1, 0.2*inch))
+        story.extend([
+            Paragraph('EXECUTIVE SUMMARY', heading1_style),
+            Spacer(1, 0.2*inch)
+        ])
 
         summary_text = """
         This comprehensive security assessment report presents findings from automated security scanning
         performed on <b>{}</b>. The analysis includes Static Application Security Testing (SAST),
         Software Composition Analysis (SCA), and Secret Detection across the entire codebase.
-        """.format(html_escape(PROJECT_NAME))
-        story.append(Paragraph(summary_text, body_style))
-        story.append(Spacer(1, 0.2*inch))
+        """.format(html_escape(project_name))
+        story.extend([
+            Paragraph(summary_text, body_style),
+            Spacer(1, 0.2*inch)
+        ])
 
         # Statistics summary table
-        summary_data = [
-            ['Metric', 'Count', 'Percentage', 'Risk Impact'],
-            ['CRITICAL', str(stats['critical']),
-             '{:.1f}%'.format((stats['critical']/max(stats['total'],1))*100),
-             '⚠ Immediate Action Required'],
-            ['HIGH', str(stats['high']),
-             '{:.1f}%'.format((stats['high']/max(stats['total'],1))*100),
-             '⚠ Priority Remediation'],
-            ['MEDIUM', str(stats['medium']),
-             '{:.1f}%'.format((stats['medium']/max(stats['total'],1))*100),
-             '⚡ Planned Fix'],
-            ['LOW', str(stats['low']),
-             '{:.1f}%'.format((stats['low']/max(stats['total'],1))*100),
-             '📋 Monitor'],
-            ['INFO', str(stats['info']),
-             '{:.1f}%'.format((stats['info']/max(stats['total'],1))*100),
-             'ℹ Informational'],
-            ['TOTAL', str(stats['total']), '100%', '']
+        severity_rows = [
+            ('CRITICAL', stats['critical'], '⚠ Immediate Action Required'),
+            ('HIGH', stats['high'], '⚠ Priority Remediation'),
+            ('MEDIUM', stats['medium'], '⚡ Planned Fix'),
+            ('LOW', stats['low'], '📋 Monitor'),
+            ('INFO', stats['info'], 'ℹ Informational')
         ]
+        total = max(stats['total'], 1)
+        percentages = {name: format(count / total * 100, '.1f') + '%'
+                       for name, count, _ in severity_rows}
+        summary_data = (
+            [['Metric', 'Count', 'Percentage', 'Risk Impact']] +
+            [[name, str(count), percentages[name], impact]
+             for name, count, impact in severity_rows] +
+            [['TOTAL', str(stats['total']), '100%', '']]
+        )
 
         summary_table = Table(summary_data, colWidths=[3*cm, 2*cm, 2.5*cm, 5.5*cm])
-        summary_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), HexColor('#1e3a5f')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
-            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 11),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-            ('TOPPADDING', (0, 0), (-1, 0), 12),
-            ('BACKGROUND', (0, 1), (-1, 1), HexColor('#ffebee')),
-            ('BACKGROUND', (0, 2), (-1, 2), HexColor('#fff3e0')),
-            ('BACKGROUND', (0, 3), (-1, 3), HexColor('#fffde7')),
-            ('BACKGROUND', (0, 4), (-1, 4), HexColor('#e3f2fd')),
-            ('BACKGROUND', (0, 5), (-1, 5), HexColor('#f5f5f5')),
-            ('BACKGROUND', (0, 6), (-1, 6), HexColor('#e0e0e0')),
-            ('FONTNAME', (0, 6), (-1, 6), 'Helvetica-Bold'),
-            ('GRID', (0, 0), (-1, -1), 1, colors.grey),
-            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE')
-        ]))
-        story.append(summary_table)
-        story.append(Spacer(1, 0.3*inch))
+        summary_table.setStyle(table_styles['summary'])
+        story.extend([
+            summary_table,
+            Spacer(1, 0.3*inch)
+        ])
 
         # ==================== PIE CHART ====================
         if stats['total'] > 0:
@@ -885,8 +1002,10 @@ if has_reportlab:
             pie.slices[3].fillColor = SEVERITY_COLORS['LOW']
             pie.slices[4].fillColor = SEVERITY_COLORS['INFO']
             drawing.add(pie)
-            story.append(drawing)
-            story.append(Spacer(1, 0.2*inch))
+            story.extend([
+                drawing,
+                Spacer(1, 0.2*inch)
+            ])
 
         # ==================== BAR CHART ====================
         story.append(Paragraph('Findings by Security Tool', heading2_style))
@@ -909,8 +1028,10 @@ if has_reportlab:
                                       tool_stats['TruffleHog']['total']], default=10) * 1.2
         bar.bars[0].fillColor = HexColor('#1976d2')
         drawing.add(bar)
-        story.append(drawing)
-        story.append(Spacer(1, 0.3*inch))
+        story.extend([
+            drawing,
+            Spacer(1, 0.3*inch)
+        ])
 
         # Key findings
         story.append(Paragraph('Key Findings', heading2_style))
@@ -926,66 +1047,61 @@ if has_reportlab:
         if stats['total'] == 0:
             key_findings.append('• ✅ <b>No security issues detected</b> - excellent security posture')
 
-        for finding in key_findings:
-            story.append(Paragraph(finding, body_style))
-
+        story.extend(Paragraph(finding, body_style) for finding in key_findings)
         story.append(PageBreak())
 
         # ==================== DETAILED FINDINGS ====================
-        story.append(Paragraph('DETAILED FINDINGS', heading1_style))
-        story.append(Spacer(1, 0.2*inch))
+        story.extend([
+            Paragraph('DETAILED FINDINGS', heading1_style),
+            Spacer(1, 0.2*inch)
+        ])
 
         # Group issues by severity and create tables
         for severity in ['CRITICAL', 'HIGH', 'MEDIUM', 'LOW', 'INFO']:
-            severity_issues = [i for i in issues_found if i['severity'] == severity]
+            severity_issues = [i for i in issues_found if i.severity == severity]
             if not severity_issues:
                 continue
 
             # Severity header
-            story.append(Paragraph(
-                '<para backColor="{}" textColor="white" fontSize="14" spaceAfter="10">'
-                '<b>{} SEVERITY - {} Issues</b></para>'.format(
-                    SEVERITY_COLORS[severity], severity, len(severity_issues)
+            story.extend([
+                Paragraph(
+                    '<para backColor="{}" textColor="white" fontSize="14" spaceAfter="10">'
+                    '<b>{} SEVERITY - {} Issues</b></para>'.format(
+                        SEVERITY_COLORS[severity], severity, len(severity_issues)
+                    ),
+                    body_style
                 ),
-                body_style
-            ))
-            story.append(Spacer(1, 0.1*inch))
+                Spacer(1, 0.1*inch)
+            ])
 
             # Create table
             table_data = [['#', 'Tool', 'File:Line', 'Issue', 'Details']]
 
             for idx, issue in enumerate(severity_issues[:50], 1):  # Limit to 50 per severity
-                location = '{}:{}'.format(issue['file'][:30], issue['line']) if issue['line'] > 0 else issue['file'][:30]
+                location = '{}:{}'.format(issue.file[:30], issue.line) if issue.line > 0 else issue.file[:30]
 
                 table_data.append([
                     str(idx),
-                    issue['tool'],
-                    Paragraph('<font size="7">{}</font>'.format(html_escape(location)), body_style),
-                    Paragraph('<font size="7"><b>{}</b></font>'.format(html_escape(issue['title'][:60])), body_style),
-                    Paragraph('<font size="7">{}</font>'.format(html_escape(issue['details'][:80])), body_style)
+                    issue.tool,
+                    Paragraph(html_escape(location), cell_style),
+                    Paragraph(html_escape(issue.title[:60]), cell_bold_style),
+                    Paragraph(html_escape(issue.details[:80]), cell_style)
                 ])
 
             issue_table = Table(table_data, colWidths=[0.8*cm, 1.5*cm, 3.5*cm, 4.5*cm, 4.7*cm])
-            issue_table.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (-1, 0), HexColor('#424242')),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
-                ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-                ('VALIGN', (0, 0), (-1, -1), 'TOP'),
-                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, 0), (-1, 0), 8),
-                ('BOTTOMPADDING', (0, 0), (-1, -1), 5),
-                ('TOPPADDING', (0, 0), (-1, -1), 5),
-                ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-                ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, HexColor('#f5f5f5')])
-            ]))
-            story.append(issue_table)
-            story.append(Spacer(1, 0.3*inch))
+            issue_table.setStyle(table_styles['issue'])
+            story.extend([
+                issue_table,
+                Spacer(1, 0.3*inch)
+            ])
 
         story.append(PageBreak())
 
         # ==================== RECOMMENDATIONS ====================
-        story.append(Paragraph('RECOMMENDATIONS', heading1_style))
-        story.append(Spacer(1, 0.2*inch))
+        story.extend([
+            Paragraph('RECOMMENDATIONS', heading1_style),
+            Spacer(1, 0.2*inch)
+        ])
 
         recommendations = []
         if stats['critical'] > 0:
@@ -1005,17 +1121,11 @@ if has_reportlab:
             rec_box = Table([[Paragraph('<b>{}. {}</b>'.format(idx, title), heading3_style)],
                            [Paragraph(desc, body_style)]],
                           colWidths=[15*cm])
-            rec_box.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (-1, 0), HexColor('#e3f2fd')),
-                ('BACKGROUND', (0, 1), (-1, 1), colors.white),
-                ('BOX', (0, 0), (-1, -1), 1, HexColor('#1976d2')),
-                ('TOPPADDING', (0, 0), (-1, -1), 10),
-                ('BOTTOMPADDING', (0, 0), (-1, -1), 10),
-                ('LEFTPADDING', (0, 0), (-1, -1), 10),
-                ('RIGHTPADDING', (0, 0), (-1, -1), 10)
-            ]))
-            story.append(rec_box)
-            story.append(Spacer(1, 0.15*inch))
+            rec_box.setStyle(table_styles['recommendation'])
+            story.extend([
+                rec_box,
+                Spacer(1, 0.15*inch)
+            ])
 
         # Build PDF
         doc.build(story, canvasmaker=NumberedCanvas)
@@ -1026,26 +1136,254 @@ if has_reportlab:
         import traceback
         traceback.print_exc()
 
-else:
-    print('  ❌ ReportLab not available, cannot generate PDF')
-
-# Save summary JSON
-summary = {
-    'total': stats['total'],
-    'critical': stats['critical'],
-    'high': stats['high'],
-    'medium': stats['medium'],
-    'low': stats['low'],
-    'info': stats['info'],
-    'risk_level': risk_level,
-    'risk_score': round(risk_score, 1)
-}
+        return False
+
+    return True
+
+
+def write_summary(output_pdf_path, stats, risk):
+    """Save summary JSON next to the PDF report"""
+    risk_score, risk_level, _ = risk
+    summary = {
+        'total': stats['total'],
+        'critical': stats['critical'],
+        'high': stats['high'],
+        'medium': stats['medium'],
+        'low': stats['low'],
+        'info': stats['info'],
+        'risk_level': risk_level,
+        'risk_score': round(risk_score, 1)
+    }
+
+    summary_file = summary_file_for(output_pdf_path)
+    dump_json_file(summary_file, summary)
+    return summary_file
+
+
+# ============================================================================
+# REPORT CACHING
+# ============================================================================
+
+# Scan result files that feed the report
+INPUT_FILES = ('semgrep.json', 'trivy.json', 'trufflehog.json')
+
+# Written next to the PDF so pipeline steps can find the report without globbing
+LAST_REPORT_FILE = '.last_report_path'
+
+
+def file_sha256(path):
+    """SHA-256 of a file's content"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def report_input_digest(input_dir, metadata, include_scan_date=False):
+    """
+    SHA-256 over scan results, report metadata and this generator.
+    A defaulted scan date (current time) is left out so re-runs can match.
+    """
+    digest = hashlib.sha256()
+    for name in INPUT_FILES:
+        digest.update(name.encode())
+        try:
+            with open(Path(input_dir) / name, 'rb') as f:
+                for chunk in iter(lambda: f.read(1 << 20), b''):
+                    digest.update(chunk)
+        except FileNotFoundError:
+            pass
+
+    fields = {key: value for key, value in metadata.items()
+              if include_scan_date or key != 'scan_date'}
+    digest.update(json.dumps(fields, sort_keys=True).encode())
+    digest.update(Path(__file__).read_bytes())
+    return digest.hexdigest()
+
+
+def summary_file_for(output_pdf_path):
+    """Summary JSON written next to the PDF report"""
+    return output_pdf_path.parent / 'summary.json'
+
+
+def digest_file_for(output_pdf_path):
+    """Sidecar file recording the input digest and summary digest of a generated PDF"""
+    return output_pdf_path.with_name(output_pdf_path.name + '.sha256')
+
+
+def record_report_digest(output_pdf_path, digest):
+    """Write the sidecar, the summary digest ties summary.json to this PDF build"""
+    summary_digest = file_sha256(summary_file_for(output_pdf_path))
+    digest_file_for(output_pdf_path).write_text(f'{digest}\n{summary_digest}\n')
+
+
+def report_is_current(output_pdf_path, digest):
+    """Check whether the PDF and its summary were already built from these inputs"""
+    try:
+        recorded = digest_file_for(output_pdf_path).read_text().split()
+        summary_digest = file_sha256(summary_file_for(output_pdf_path))
+    except FileNotFoundError:
+        return False
+    return recorded == [digest, summary_digest] and output_pdf_path.exists()
 
-summary_file = output_pdf_path.parent / 'summary.json'
-summary_file.write_text(json.dumps(summary, indent=2))
 
-print('\n✅ Report generation completed!')
-print(f'📊 Files created:')
-print(f'   - {output_pdf_path}')
-print(f'   - {summary_file}')
-print(f'\n🎯 Total findings: {stats["total"]} ({stats["critical"]} critical, {stats["high"]} high)')
+def record_last_report(output_pdf_path):
+    """Write the final PDF path to the sentinel file in the output directory"""
+    (output_pdf_path.parent / LAST_REPORT_FILE).write_text(str(output_pdf_path))
+
+
+# ============================================================================
+# MAIN EXECUTION
+# ============================================================================
+
+def main(argv=None):
+    """Main execution"""
+    # Parse arguments
+    args = parse_arguments(argv)
+
+    if not Path(args.input_dir).is_dir():
+        print(f'❌ Input directory not found: {args.input_dir}')
+        return 1
+
+    # Get metadata
+    metadata = get_metadata(args)
+
+    print(f'Project: {metadata["project_name"]}')
+    print(f'Document: {metadata["document_number"]}\n')
+
+    # Get absolute output path
+    output_pdf_path = Path(args.output_pdf).resolve()
+
+    # Skip the whole build when nothing that feeds the report has changed
+    digest = report_input_digest(args.input_dir, metadata, include_scan_date=bool(args.scan_date))
+    if not args.force and report_is_current(output_pdf_path, digest):
+        print(f'✅ Report is up to date (inputs unchanged): {output_pdf_path}')
+        print('   Use --force to regenerate')
+        record_last_report(output_pdf_path)
+        return 0
+
+    # Drop the previous run's markers so a failed build can't be mistaken for this one
+    digest_file_for(output_pdf_path).unlink(missing_ok=True)
+    (output_pdf_path.parent / LAST_REPORT_FILE).unlink(missing_ok=True)
+
+    issues_found, stats, tool_stats = collect_findings(args.input_dir)
+
+    # Calculate risk score and level once for the whole report
+    risk = calculate_risk_score(stats)
+    risk_score, risk_level, _ = risk
+
+    print('\nSummary:')
+    print('  Total issues: {}'.format(stats['total']))
+    print('  Critical: {}'.format(stats['critical']))
+    print('  High: {}'.format(stats['high']))
+    print('  Medium: {}'.format(stats['medium']))
+    print('  Low: {}'.format(stats['low']))
+    print('  Info: {}'.format(stats['info']))
+    print('  Risk Level: {} ({:.1f}/10)'.format(risk_level, risk_score))
+
+    print('\nGenerating comprehensive PDF report...')
+
+    output_pdf_path.parent.mkdir(parents=True, exist_ok=True)
+
+    pdf_built = generate_pdf(output_pdf_path, metadata, issues_found, stats, tool_stats, risk)
+    summary_file = write_summary(output_pdf_path, stats, risk)
+    if not pdf_built:
+        print(f'\n❌ PDF generation failed, summary saved: {summary_file}')
+        return 1
+
+    record_report_digest(output_pdf_path, digest)
+    record_last_report(output_pdf_path)
+
+    print('\n✅ Report generation completed!')
+    print(f'📊 Files created:')
+    print(f'   - {output_pdf_path}')
+    print(f'   - {summary_file}')
+    print(f'\n🎯 Total findings: {stats["total"]} ({stats["critical"]} critical, {stats["high"]} high)')
+
+    return 0
+
+
+# ============================================================================
+# BATCH GENERATION
+# ============================================================================
+
+def _generate_one(argv):
+    """Pool worker: generate a single report from an argv list, returns the exit code"""
+    try:
+        return main(argv)
+    except SystemExit as e:
+        # argparse exits on bad arguments, a dead worker would hang pool.map.
+        # sys.exit() codes: None/0 is success, an int is kept, anything else (a message) is 1
+        if e.code is None:
+            return 0
+        return e.code if isinstance(e.code, int) else 1
+    except Exception as e:
+        print(f'❌ Report generation failed: {e}')
+        return 1
+
+
+def _generate_group(argv_list):
+    """Pool worker: generate reports that share an output directory one after another"""
+    return [_generate_one(argv) for argv in argv_list]
+
+
+def _output_dir_of(argv):
+    """Resolved output directory of an argv list, or None if the arguments are invalid"""
+    try:
+        # The worker reports the argparse error, keep the pre-check quiet
+        with open(os.devnull, 'w') as devnull, redirect_stderr(devnull):
+            return Path(parse_arguments(argv).output_pdf).resolve().parent
+    except SystemExit:
+        return None
+
+
+def generate_reports(argv_list, processes=None):
+    """
+    Generate several reports in parallel worker processes.
+    Each entry is an argv list as accepted by main(); returns the exit codes.
+    PDF building is CPU-bound under the GIL, so processes scale where threads don't.
+    Entries with the same output directory share summary.json and the
+    .last_report_path sentinel, so they run in one worker, in order.
+    """
+    groups = {}
+    for index, argv in enumerate(argv_list):
+        key = _output_dir_of(argv) or ('invalid', index)
+        groups.setdefault(key, []).append(index)
+    groups = list(groups.values())
+
+    with Pool(processes or cpu_count()) as pool:
+        group_codes = pool.map(_generate_group,
+                               [[argv_list[i] for i in indices] for indices in groups],
+                               chunksize=1)
+
+    codes = [1] * len(argv_list)
+    for indices, group in zip(groups, group_codes):
+        for index, code in zip(indices, group):
+            codes[index] = code
+    return codes
+
+
+def batch_main(argv=None):
+    """Generate every report listed in a batch file"""
+    parser = argparse.ArgumentParser(description='Generate several security reports in parallel')
+    parser.add_argument('--batch', required=True,
+                       help='File with one line of generator arguments per report (# starts a comment)')
+    parser.add_argument('--processes', type=int, default=None,
+                       help='Worker processes (default: CPU count)')
+    args = parser.parse_args(argv)
+
+    argv_list = [argv for argv in (shlex.split(line, comments=True)
+                                   for line in Path(args.batch).read_text().splitlines()) if argv]
+    if not argv_list:
+        print(f'❌ No reports listed in {args.batch}')
+        return 1
+
+    codes = generate_reports(argv_list, args.processes)
+    failed = sum(1 for code in codes if code)
+    print(f'\n📚 Batch completed: {len(codes) - failed}/{len(codes)} reports generated')
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(batch_main() if '--batch' in sys.argv[1:] else main())
@@ -5,12 +5,51 @@ Runs Semgrep, Trivy, and TruffleHog on specific project folders
 """
 import os
 import sys
+import re
 import json
-import subprocess
+import mmap
+import time
+import asyncio
+import hashlib
 import argparse
+import tempfile
+import importlib.util
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 from datetime import datetime
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+try:
+    import blake3
+except ImportError:
+    blake3 = None
+
+try:
+    import pathspec
+except ImportError:
+    pathspec = None
+
+# Persistent per-file scan result cache
+CACHE_DIR = Path.home() / '.cache' / 'tts-security'
+CACHE_TTL = 24 * 3600
+CACHE_MAX_ENTRIES = 2000
+
+# Above this many changed files a full folder scan is cheaper than a file list
+CACHE_MAX_TARGETS = 1000
+
+# Files smaller than this are read directly, mmap setup costs more than it saves
+MMAP_MIN_SIZE = 64 * 1024
+
 # Project type detection and default scan folders
 PROJECT_CONFIGS = {
     'maven': {
@@ -46,6 +85,31 @@ PROJECT_CONFIGS = {
 }
 
 
+def parse_json(raw):
+    """Parse JSON bytes, using orjson when available"""
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def iter_json_items(path, prefix):
+    """Yield items of a top-level JSON array, streaming with ijson when available"""
+    if ijson is not None:
+        with open(path, 'rb') as f:
+            yield from ijson.items(f, prefix)
+        return
+    data = parse_json(Path(path).read_bytes())
+    yield from data.get(prefix.split('.', 1)[0]) or []
+
+
+def dump_json(data, indent=True, sort_keys=False):
+    """Serialize data as JSON bytes (indented by default), using orjson when available"""
+    if orjson is not None:
+        option = (orjson.OPT_INDENT_2 if indent else 0) | (orjson.OPT_SORT_KEYS if sort_keys else 0)
+        return orjson.dumps(data, option=option or None)
+    return json.dumps(data, indent=2 if indent else None, sort_keys=sort_keys).encode()
+
+
 def print_banner():
     """Print security scan banner"""
     print("=" * 80)
@@ -81,15 +145,16 @@ def get_scan_folders(project_type, custom_folders=None):
     return ['src/']
 
 
+@lru_cache(maxsize=8)
 def get_exclude_patterns(project_type):
-    """Get exclude patterns based on project type"""
-    base_exclude = ['.git/', '.svn/', '.hg/']
+    """Get exclude patterns based on project type (cached, copy before extending)"""
+    base_exclude = ('.git/', '.svn/', '.hg/')
 
     if project_type in PROJECT_CONFIGS:
-        return base_exclude + PROJECT_CONFIGS[project_type]['exclude']
+        return base_exclude + tuple(PROJECT_CONFIGS[project_type]['exclude'])
 
     # Generic fallback
-    return base_exclude + ['node_modules/', 'target/', 'dist/', 'build/']
+    return base_exclude + ('node_modules/', 'target/', 'dist/', 'build/')
 
 
 def create_output_dir(output_dir):
@@ -112,8 +177,8 @@ def build_scan_paths(project_path, scan_folders):
         folder_path = project_path / folder.strip()
         if folder_path.exists():
             scan_paths.append(str(folder_path))
-            # Count files in folder
-            file_count = sum(1 for _ in folder_path.rglob('*') if _.is_file())
+            # Count files in folder (os.walk uses directory entry types, no stat per file)
+            file_count = sum(len(files) for _, _, files in os.walk(folder_path))
             print(f"   ✓ {folder} ({file_count} files)")
         else:
             print(f"   ⚠️  {folder} (not found, skipping)")
@@ -125,7 +190,305 @@ def build_scan_paths(project_path, scan_folders):
     return scan_paths
 
 
-def run_semgrep(scan_paths, output_dir, exclude_patterns):
+def new_hasher():
+    """Content hasher, BLAKE3 when available"""
+    return blake3.blake3() if blake3 is not None else hashlib.blake2b()
+
+
+EMPTY_HASH = new_hasher().hexdigest()
+
+
+def atomic_write(path, data):
+    """Write bytes via a unique temp file and rename, safe with concurrent writers"""
+    with tempfile.NamedTemporaryFile(dir=path.parent, delete=False) as tmp:
+        tmp.write(data)
+    try:
+        os.replace(tmp.name, path)
+    except OSError:
+        os.unlink(tmp.name)
+        raise
+
+
+def file_hash(f, size):
+    """Content hash of an open binary file, memory-mapped when large"""
+    if size == 0:
+        return EMPTY_HASH
+    hasher = new_hasher()
+    if size < MMAP_MIN_SIZE:
+        hasher.update(f.read())
+    else:
+        with mmap.mmap(f.fileno(), size, access=mmap.ACCESS_READ) as m:
+            hasher.update(m)
+    return hasher.hexdigest()
+
+
+class GlobSpec:
+    """Fallback for pathspec.PathSpec when pathspec is not installed (basic gitignore globs)"""
+
+    def __init__(self, lines):
+        self.regexes = [glob_to_regex(line) for line in lines if line and not line.startswith('#')]
+
+    def match_file(self, path):
+        return any(regex.search(path) for regex in self.regexes)
+
+
+def glob_to_regex(pattern):
+    """Translate a gitignore-style glob into a regex over '/'-separated relative paths"""
+    anchored = pattern.startswith('/') or '/' in pattern.rstrip('/')
+    body = re.escape(pattern.strip('/')).replace(r'\*\*', '.*').replace(r'\*', '[^/]*').replace(r'\?', '[^/]')
+    prefix = '^' if anchored else '(?:^|/)'
+    suffix = '/' if pattern.endswith('/') else '(?:/|$)'
+    return re.compile(prefix + body + suffix)
+
+
+@lru_cache(maxsize=8)
+def compile_excludes(patterns):
+    """Compile a tuple of exclude patterns once (gitignore semantics via pathspec when available)"""
+    if pathspec is not None:
+        return pathspec.PathSpec.from_lines('gitwildmatch', patterns)
+    return GlobSpec(patterns)
+
+
+def exclude_regexes(spec, root):
+    """
+    Regexes for the compiled exclude patterns, anchored to absolute paths under root.
+    TruffleHog parses them with Go's regexp (RE2); pathspec's (?P<ps_d>...) named
+    groups and (?:...) groups are valid RE2 syntax.
+    """
+    if isinstance(spec, GlobSpec):
+        regexes = [regex.pattern for regex in spec.regexes]
+    else:
+        regexes = [p.regex.pattern for p in spec.patterns if p.include and p.regex is not None]
+
+    # Patterns match relative paths, the tools see paths below root
+    root_prefix = '^' + re.escape(os.path.abspath(root).rstrip('/') + '/')
+    anchored = []
+    for regex in regexes:
+        if regex.startswith('(?:^|/)'):
+            anchored.append(root_prefix + '(?:.+/)?' + regex[len('(?:^|/)'):])
+        else:
+            anchored.append(root_prefix + regex[1:])
+    return anchored
+
+
+def write_if_changed(path, text):
+    """Write a text file only when its content differs, keeps mtime stable across runs"""
+    try:
+        if path.read_text() == text:
+            return
+    except FileNotFoundError:
+        pass
+    path.write_text(text)
+
+
+def filter_files(scan_paths, spec):
+    """List files under the scan paths not matched by the exclude spec, pruning directories early"""
+    files = []
+    for scan_path in scan_paths:
+        for root, dirnames, filenames in os.walk(scan_path):
+            rel_root = os.path.relpath(root, scan_path)
+            rel_root = '' if rel_root == '.' else rel_root + '/'
+            dirnames[:] = [d for d in dirnames if not spec.match_file(rel_root + d + '/')]
+            files.extend(os.path.join(root, f) for f in filenames
+                         if not spec.match_file(rel_root + f))
+    return files
+
+
+class ScanCache:
+    """
+    Per-file findings cache keyed by (content hash, tool, tool version, options).
+    Entries live in ~/.cache/tts-security/<tool>/, expire after CACHE_TTL and
+    the oldest are evicted beyond CACHE_MAX_ENTRIES. A stat index maps each
+    path's (st_mtime_ns, st_size) to its content hash so unchanged files are
+    not read again; there is one index per set of scan roots, so projects
+    built on the same agent don't prune each other's entries.
+    """
+
+    def __init__(self, tool, tool_version, options, scan_paths, cache_dir=CACHE_DIR):
+        self.dir = Path(cache_dir) / tool
+        (self.dir / 'index').mkdir(parents=True, exist_ok=True)
+        self.salt = '\0'.join([tool, tool_version, options]).encode()
+        roots = '\0'.join(sorted(os.path.abspath(path) for path in scan_paths))
+        self.index_file = self.dir / 'index' / f'{hashlib.sha256(roots.encode()).hexdigest()}.json'
+        try:
+            self.index = parse_json(self.index_file.read_bytes())
+        except (FileNotFoundError, ValueError):
+            self.index = {}
+        self.index_changed = False
+
+    def content_hash(self, path):
+        """Content hash of a file, reused from the stat index when mtime and size match"""
+        path = os.path.abspath(path)
+        # fstat on the open fd so the stat key and the hashed bytes are the same file
+        with open(path, 'rb') as f:
+            st = os.fstat(f.fileno())
+            entry = self.index.get(path)
+            if entry and entry[0] == st.st_mtime_ns and entry[1] == st.st_size:
+                return entry[2]
+            content_hash = file_hash(f, st.st_size)
+        self.index[path] = [st.st_mtime_ns, st.st_size, content_hash]
+        self.index_changed = True
+        return content_hash
+
+    def try_content_hash(self, path):
+        """Content hash of a file, or None if it vanished or can't be read"""
+        try:
+            return self.content_hash(path)
+        except OSError:
+            return None
+
+    def hash_files(self, paths):
+        """Content hashes for many files, hashed in parallel (the hashers release the GIL)"""
+        with ThreadPoolExecutor(max_workers=os.cpu_count()) as pool:
+            return dict(zip(paths, pool.map(self.try_content_hash, paths)))
+
+    def save_index(self, paths):
+        """Write the stat index keeping only the given paths, skipped when unchanged"""
+        keep = {os.path.abspath(path) for path in paths}
+        index = {path: entry for path, entry in self.index.items() if path in keep}
+        if not self.index_changed and len(index) == len(self.index):
+            return
+        self.index = index
+        try:
+            atomic_write(self.index_file, dump_json(self.index, indent=False))
+        except OSError as e:
+            # Only the fast path is lost, the next run hashes the files again
+            print(f"   ⚠️  Could not save cache index: {e}")
+
+    def _entry(self, content_hash):
+        key = hashlib.sha256(self.salt + content_hash.encode()).hexdigest()
+        return self.dir / f'{key}.json'
+
+    def get(self, content_hash):
+        """Cached findings for a file content, or None on miss or expiry"""
+        entry = self._entry(content_hash)
+        try:
+            if time.time() - entry.stat().st_mtime > CACHE_TTL:
+                return None
+            return parse_json(entry.read_bytes())
+        except (FileNotFoundError, ValueError):
+            return None
+
+    def put(self, content_hash, findings):
+        """Store findings for a file content (written atomically)"""
+        atomic_write(self._entry(content_hash), dump_json(findings, indent=False))
+
+    def evict(self):
+        """Remove the oldest entries beyond CACHE_MAX_ENTRIES"""
+        def mtime(entry):
+            # Another run may have evicted it already
+            try:
+                return entry.stat().st_mtime
+            except FileNotFoundError:
+                return 0
+
+        entries = sorted(self.dir.glob('*.json'), key=mtime)
+        for entry in entries[:-CACHE_MAX_ENTRIES]:
+            entry.unlink(missing_ok=True)
+
+
+async def run_command(argv, description=None, timeout=300):
+    """Run an argv list (no shell) without blocking the event loop, returns (returncode, stdout)"""
+    if description:
+        print(f"📋 {description}")
+
+    proc = await asyncio.create_subprocess_exec(
+        *argv,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.DEVNULL
+    )
+    try:
+        stdout, _ = await asyncio.wait_for(proc.communicate(), timeout)
+    except (asyncio.TimeoutError, asyncio.CancelledError):
+        proc.kill()
+        await proc.wait()
+        raise
+    return proc.returncode, stdout
+
+
+def has_output(path):
+    """True if a tool wrote a non-empty output file"""
+    try:
+        return path.stat().st_size > 0
+    except FileNotFoundError:
+        return False
+
+
+async def run_semgrep_cached(cmd_base, rule_options, scan_paths, exclude_spec):
+    """
+    Run Semgrep only on files whose content is not in the scan cache.
+    Returns the merged Semgrep JSON data (cached plus fresh findings).
+    The key has no registry version (--config=auto doesn't expose one), so
+    a cached file can miss up to CACHE_TTL of rule updates.
+    """
+    _, version = await run_command(['semgrep', '--version'], timeout=60)
+    # Only options that change per-file findings go into the key, so hosts
+    # with different --jobs or excludes share entries
+    cache = ScanCache('semgrep', version.decode().strip(), ' '.join(rule_options), scan_paths)
+
+    files = filter_files(scan_paths, exclude_spec)
+    hashes = await asyncio.to_thread(cache.hash_files, files)
+    # Drop paths not in this scan so the index stays bounded
+    cache.save_index([path for path, content_hash in hashes.items() if content_hash])
+
+    cached, misses = {}, []
+    for path, content_hash in hashes.items():
+        # Unreadable files are scanned but never cached
+        findings = cache.get(content_hash) if content_hash else None
+        if findings is None:
+            misses.append(path)
+        else:
+            cached[path] = findings
+    print(f"   💾 Cache: {len(cached)} files cached, {len(misses)} to scan")
+
+    results, errors = [], []
+    if misses:
+        # Scan only changed files when there are few, otherwise the folders
+        if cached and len(misses) <= CACHE_MAX_TARGETS:
+            targets = misses
+        else:
+            targets, cached = scan_paths, {}
+            misses = list(hashes)
+
+        returncode, stdout = await run_command(cmd_base + targets)
+        if returncode != 0 and not stdout:
+            raise RuntimeError(f'semgrep exited with code {returncode}')
+        data = parse_json(stdout)
+        results = data.get('results', [])
+        errors = data.get('errors', [])
+
+        # Split findings per file and store them without the path, so
+        # identical content elsewhere in the tree reuses them
+        by_path = {os.path.normpath(path): [] for path in misses}
+        for result in results:
+            by_path.setdefault(os.path.normpath(result.get('path', '')), []).append(
+                {key: value for key, value in result.items() if key != 'path'})
+        # Files Semgrep failed on (timeouts, parse errors) would look clean,
+        # an error without a path makes the whole run unreliable
+        failed = {os.path.normpath(error['path']) for error in errors if error.get('path')}
+        try:
+            if all(error.get('path') for error in errors):
+                for path in misses:
+                    norm_path = os.path.normpath(path)
+                    if hashes[path] and norm_path not in failed:
+                        cache.put(hashes[path], by_path[norm_path])
+            cache.evict()
+        except OSError as e:
+            # The scan itself succeeded, only later runs lose the reuse
+            print(f"   ⚠️  Could not update scan cache: {e}")
+
+    for path, findings in cached.items():
+        results.extend(dict(finding, path=path) for finding in findings)
+
+    # Stable order so unchanged findings give byte-identical semgrep.json
+    results.sort(key=lambda r: (r.get('path', ''),
+                                r.get('start', {}).get('line', 0),
+                                r.get('start', {}).get('col', 0),
+                                r.get('check_id', '')))
+    return {'results': results, 'errors': errors}
+
+
+async def run_semgrep(scan_paths, output_dir, exclude_patterns, exclude_spec, use_cache=False):
     """Run Semgrep SAST scan"""
     print("\n" + "=" * 80)
     print("🔍 Running Semgrep (SAST)")
@@ -139,30 +502,49 @@ def run_semgrep(scan_paths, output_dir, exclude_patterns):
         for pattern in exclude_patterns:
             exclude_args.extend(['--exclude', pattern])
 
+        # Semgrep is CPU-bound per file, use one worker per core.
+        # --metrics stays on because --config=auto requires it.
+        jobs = os.cpu_count() or 4
+
         # Run semgrep on each scan path
-        cmd = [
+        # Options that decide what Semgrep reports for a given file
+        rule_options = ['--config=auto', '--timeout', '60', '--timeout-threshold', '3']
+
+        cmd_base = [
             'semgrep', 'scan',
-            '--config=auto',
+            rule_options[0],
             '--json',
-            '--quiet'
-        ] + exclude_args + scan_paths
-
-        print(f"📋 Command: {' '.join(cmd[:5])}... (scanning {len(scan_paths)} folders)")
-
-        result = subprocess.run(
-            cmd,
-            capture_output=True,
-            text=True,
-            timeout=300
-        )
+            '--quiet',
+            '--jobs', str(jobs),
+            '--disable-version-check'
+        ] + rule_options[1:] + exclude_args
+        # Semgrep writes the JSON itself instead of piping it through us
+        cmd = cmd_base + ['--output', str(output_file)] + scan_paths
+        description = f"Command: {' '.join(cmd[:5])}... (scanning {len(scan_paths)} folders)"
+
+        if use_cache:
+            print(f"📋 {description}")
+            try:
+                data = await run_semgrep_cached(cmd_base, rule_options, scan_paths, exclude_spec)
+            except asyncio.TimeoutError:
+                raise
+            except Exception as e:
+                # A broken cache must never turn into an empty result
+                print(f"⚠️  Semgrep cache failed ({e}), running a full scan")
+                description = None
+            else:
+                # Sorted keys, cached findings get their path key added back last
+                output_file.write_bytes(dump_json(data, indent=False, sort_keys=True))
+                print(f"✅ Semgrep completed: {len(data['results'])} findings")
+                return
 
-        if result.returncode == 0 or result.stdout:
-            output_file.write_text(result.stdout)
+        output_file.unlink(missing_ok=True)
+        returncode, _ = await run_command(cmd, description)
 
+        if returncode == 0 or has_output(output_file):
             # Parse results
             try:
-                data = json.loads(result.stdout)
-                findings = len(data.get('results', []))
+                findings = sum(1 for _ in iter_json_items(output_file, 'results.item'))
                 print(f"✅ Semgrep completed: {findings} findings")
             except:
                 print(f"✅ Semgrep completed (output saved)")
@@ -170,7 +552,7 @@ def run_semgrep(scan_paths, output_dir, exclude_patterns):
             print(f"⚠️  Semgrep failed, creating empty result")
             output_file.write_text('{"results":[]}')
 
-    except subprocess.TimeoutExpired:
+    except asyncio.TimeoutError:
         print(f"⚠️  Semgrep timeout (>5 min), creating empty result")
         output_file.write_text('{"results":[]}')
     except Exception as e:
@@ -178,7 +560,20 @@ def run_semgrep(scan_paths, output_dir, exclude_patterns):
         output_file.write_text('{"results":[]}')
 
 
-def run_trivy(scan_paths, output_dir, project_type):
+def trivy_skip_args(exclude_patterns):
+    """Trivy --skip-dirs / --skip-files arguments for the exclude patterns"""
+    args = []
+    for pattern in exclude_patterns:
+        glob = pattern.strip('/')
+        # Like gitignore, a leading or inner slash anchors the pattern at the scan root
+        anchored = pattern.startswith('/') or '/' in glob
+        if not anchored and not glob.startswith('**'):
+            glob = '**/' + glob
+        args.extend(['--skip-dirs' if pattern.endswith('/') else '--skip-files', glob])
+    return args
+
+
+async def run_trivy(scan_paths, output_dir, project_type, exclude_patterns):
     """Run Trivy vulnerability scanner"""
     print("\n" + "=" * 80)
     print("🔍 Running Trivy (SCA)")
@@ -195,27 +590,21 @@ def run_trivy(scan_paths, output_dir, project_type):
             '--format', 'json',
             '--severity', 'CRITICAL,HIGH,MEDIUM,LOW',
             '--scanners', 'vuln,secret,misconfig',
-            scan_target
-        ]
-
-        print(f"📋 Command: {' '.join(cmd[:6])}...")
-
-        result = subprocess.run(
-            cmd,
-            capture_output=True,
-            text=True,
-            timeout=300
-        )
+            '--output', str(output_file)
+        ] + trivy_skip_args(exclude_patterns) + [scan_target]
 
-        if result.returncode == 0 or result.stdout:
-            output_file.write_text(result.stdout)
+        output_file.unlink(missing_ok=True)
+        returncode, _ = await run_command(cmd, f"Command: {' '.join(cmd[:6])}...")
 
+        if returncode == 0 or has_output(output_file):
             # Parse results
             try:
-                data = json.loads(result.stdout)
-                vulns = sum(len(r.get('Vulnerabilities', [])) for r in data.get('Results', []))
-                secrets = sum(len(r.get('Secrets', [])) for r in data.get('Results', []))
-                misconfigs = sum(len(r.get('Misconfigurations', [])) for r in data.get('Results', []))
+                # Count per result while streaming, Trivy output can be hundreds of MB
+                vulns = secrets = misconfigs = 0
+                for result in iter_json_items(output_file, 'Results.item'):
+                    vulns += len(result.get('Vulnerabilities') or [])
+                    secrets += len(result.get('Secrets') or [])
+                    misconfigs += len(result.get('Misconfigurations') or [])
                 print(f"✅ Trivy completed:")
                 print(f"   - Vulnerabilities: {vulns}")
                 print(f"   - Secrets: {secrets}")
@@ -226,7 +615,7 @@ def run_trivy(scan_paths, output_dir, project_type):
             print(f"⚠️  Trivy failed, creating empty result")
             output_file.write_text('{"Results":[]}')
 
-    except subprocess.TimeoutExpired:
+    except asyncio.TimeoutError:
         print(f"⚠️  Trivy timeout (>5 min), creating empty result")
         output_file.write_text('{"Results":[]}')
     except Exception as e:
@@ -234,7 +623,100 @@ def run_trivy(scan_paths, output_dir, project_type):
         output_file.write_text('{"Results":[]}')
 
 
-def run_trufflehog(scan_paths, output_dir):
+# Maximum TruffleHog findings kept for the report
+TRUFFLEHOG_LIMIT = 100
+
+# Longest TruffleHog output line read, longer lines are skipped
+TRUFFLEHOG_LINE_LIMIT = 1 << 20
+
+
+# Monorepo module roots that get their own TruffleHog run
+MONOREPO_ROOTS = ('apps', 'libs', 'packages', 'modules')
+
+
+async def read_line(stream):
+    """
+    Next line from a stream, b'' at EOF. A line longer than the stream limit
+    is consumed and returned as None instead of raising, so reading can go on.
+    """
+    oversized = False
+    while True:
+        try:
+            line = await stream.readuntil(b'\n')
+        except asyncio.IncompleteReadError as e:
+            line = e.partial
+        except asyncio.LimitOverrunError as e:
+            # Drop what is buffered and keep reading until the line ends
+            oversized = True
+            await stream.readexactly(e.consumed)
+            continue
+        return None if oversized else line
+
+
+async def stream_trufflehog(cmds, output_file, raw_file, limit=TRUFFLEHOG_LIMIT):
+    """
+    Stream NDJSON output of one or more TruffleHog runs into the result files, returns secrets kept.
+    Each run keeps at most `limit` lines; they are sorted and written in command
+    order so the result files don't depend on which run finished first.
+    """
+    procs = [
+        await asyncio.create_subprocess_exec(
+            *cmd,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL,
+            limit=TRUFFLEHOG_LINE_LIMIT
+        )
+        for cmd in cmds
+    ]
+    buffers = [[] for _ in procs]
+    lines = []
+
+    def stop(proc):
+        # Runs already at EOF are exiting on their own, killing them would
+        # race asyncio's child watcher for the exit status
+        if proc.returncode is None and not proc.stdout.at_eof():
+            try:
+                proc.kill()
+            except ProcessLookupError:
+                pass
+
+    async def drain(proc, kept):
+        while len(kept) < limit:
+            line = await read_line(proc.stdout)
+            if line is None:
+                print(f"   ⚠️  Skipped a TruffleHog result over {TRUFFLEHOG_LINE_LIMIT >> 20} MiB")
+                continue
+            if not line:
+                break
+            line = line.strip()
+            if not line.startswith(b'{'):
+                continue
+            try:
+                parse_json(line)
+            except json.JSONDecodeError:
+                continue
+            kept.append(line)
+        # Stop TruffleHog once enough secrets are collected (like piping to head)
+        stop(proc)
+
+    try:
+        await asyncio.gather(*(drain(proc, kept) for proc, kept in zip(procs, buffers)))
+    finally:
+        for proc in procs:
+            stop(proc)
+        for proc in procs:
+            await proc.wait()
+
+        # Written even after an error so secrets found so far survive.
+        # Original bytes are passed through, no re-serialization.
+        lines = [line for kept in buffers for line in sorted(kept)][:limit]
+        with open(output_file, 'wb') as dst, open(raw_file, 'wb') as raw:
+            dst.write(b'{"secrets":[' + b','.join(lines) + b']}')
+            raw.write(b'\n'.join(lines))
+    return len(lines)
+
+
+async def run_trufflehog(scan_paths, output_dir, exclude_spec):
     """Run TruffleHog secret scanner"""
     print("\n" + "=" * 80)
     print("🔍 Running TruffleHog (Secret Detection)")
@@ -242,51 +724,78 @@ def run_trufflehog(scan_paths, output_dir):
 
     output_file = output_dir / 'trufflehog.json'
     raw_file = output_dir / 'trufflehog-raw.json'
+    # A previous run's result must not pass for a partial one
+    output_file.unlink(missing_ok=True)
 
     try:
         scan_target = scan_paths[0] if scan_paths else '.'
 
+        # TruffleHog takes a file of regexes, one per line
+        excludes = exclude_regexes(exclude_spec, scan_target)
+        exclude_file = output_dir / 'trufflehog-exclude.txt'
+        write_if_changed(exclude_file, '\n'.join(excludes) + '\n')
+
         cmd = [
             'trufflehog', 'filesystem',
             '--json',
             '--no-verification',
+            '--exclude-paths', str(exclude_file),
             scan_target
         ]
 
         print(f"📋 Command: {' '.join(cmd[:4])}...")
 
-        result = subprocess.run(
-            cmd,
-            capture_output=True,
-            text=True,
-            timeout=300
-        )
-
-        if result.stdout:
-            # Limit to first 100 results
-            lines = result.stdout.strip().split('\n')[:100]
-            raw_file.write_text('\n'.join(lines))
-
-            # Convert to JSON array
-            if lines:
-                json_array = '{"secrets":[' + ','.join(lines) + ']}'
-                output_file.write_text(json_array)
-                print(f"✅ TruffleHog completed: {len(lines)} secrets found")
-            else:
-                output_file.write_text('{"secrets":[]}')
-                print(f"✅ TruffleHog completed: 0 secrets found")
+        # Monorepo layout: one run per module root in parallel, plus one
+        # for everything outside those roots so no file is skipped
+        roots = [os.path.join(scan_target, name) for name in MONOREPO_ROOTS
+                 if os.path.isdir(os.path.join(scan_target, name))]
+        if len(roots) >= 2:
+            rest_file = output_dir / 'trufflehog-exclude-rest.txt'
+            write_if_changed(rest_file, '\n'.join(
+                excludes + ['^' + re.escape(root + '/') for root in roots]) + '\n')
+
+            cmds = [cmd[:-1] + ['--concurrency', '8', root] for root in roots]
+            cmds.append(cmd[:-2] + [str(rest_file), '--concurrency', '8', scan_target])
+            print(f"   🔀 Fan-out: {len(cmds)} parallel runs "
+                  f"({', '.join(os.path.basename(root) for root in roots)}, remainder)")
         else:
-            output_file.write_text('{"secrets":[]}')
-            print(f"✅ TruffleHog completed: 0 secrets found")
+            cmds = [cmd]
 
-    except subprocess.TimeoutExpired:
-        print(f"⚠️  TruffleHog timeout (>5 min), creating empty result")
-        output_file.write_text('{"secrets":[]}')
+        count = await asyncio.wait_for(stream_trufflehog(cmds, output_file, raw_file), 300)
+        print(f"✅ TruffleHog completed: {count} secrets found")
+
+    except asyncio.TimeoutError:
+        print(f"⚠️  TruffleHog timeout (>5 min)")
+        keep_partial_trufflehog(output_file)
     except Exception as e:
         print(f"⚠️  TruffleHog error: {e}")
+        keep_partial_trufflehog(output_file)
+
+
+def keep_partial_trufflehog(output_file):
+    """Keep secrets streamed before a failure, create an empty result only if there are none"""
+    try:
+        count = sum(1 for _ in iter_json_items(output_file, 'secrets.item'))
+    except (OSError, ValueError):
+        count = 0
+    if count:
+        print(f"   Keeping {count} secrets found before the failure")
+    else:
+        print(f"   Creating empty result")
         output_file.write_text('{"secrets":[]}')
 
 
+async def run_all_scans(scan_paths, output_dir, exclude_patterns, project_type, use_cache=False):
+    """Run all scanners concurrently, total time is the slowest scan rather than the sum"""
+    exclude_spec = compile_excludes(tuple(exclude_patterns))
+    await asyncio.gather(
+        run_semgrep(scan_paths, output_dir, exclude_patterns, exclude_spec, use_cache),
+        run_trivy(scan_paths, output_dir, project_type, exclude_patterns),
+        run_trufflehog(scan_paths, output_dir, exclude_spec),
+        return_exceptions=True
+    )
+
+
 def save_scan_metadata(output_dir, project_path, project_type, scan_folders):
     """Save scan metadata for report generation"""
     metadata = {
@@ -298,10 +807,33 @@ def save_scan_metadata(output_dir, project_path, project_type, scan_folders):
     }
 
     metadata_file = output_dir / 'scan_metadata.json'
-    metadata_file.write_text(json.dumps(metadata, indent=2))
+    metadata_file.write_bytes(dump_json(metadata))
     print(f"\n💾 Scan metadata saved: {metadata_file}")
 
 
+def generate_pdf_report(output_dir, report_pdf, project_path):
+    """Generate the PDF report in-process with generate_report.py"""
+    generator = Path(__file__).resolve().parent / 'generate_report.py'
+    spec = importlib.util.spec_from_file_location('generate_report', generator)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+
+    exit_code = module.main([
+        '--input-dir', str(output_dir),
+        '--output-pdf', report_pdf,
+        '--project-path', str(project_path)
+    ])
+
+    # The generator records the final PDF path, no need to search for it
+    last_report = Path(report_pdf).resolve().parent / module.LAST_REPORT_FILE
+    if exit_code == 0 and last_report.exists():
+        print(f"📄 PDF report: {last_report.read_text()}")
+    else:
+        print(f"⚠️  PDF report generation failed (exit code {exit_code})")
+
+    return exit_code
+
+
 def main():
     """Main execution"""
     parser = argparse.ArgumentParser(
@@ -317,6 +849,9 @@ Examples:
 
   # Explicit project type
   %(prog)s --project-path . --project-type maven --output-dir ./security-reports
+
+  # Scan and generate the PDF report in one run
+  %(prog)s --project-path . --output-dir ./security-reports --report-pdf ./security-reports/security-report.pdf
         """
     )
 
@@ -331,6 +866,10 @@ Examples:
                        help='Output directory for scan results (default: ./security-reports)')
     parser.add_argument('--exclude', default=None,
                        help='Additional exclude patterns (comma-separated)')
+    parser.add_argument('--cache', action=argparse.BooleanOptionalAction, default=False,
+                       help='Reuse cached Semgrep findings for unchanged files (default: off)')
+    parser.add_argument('--report-pdf', default=None,
+                       help='Generate the PDF report at this path after scanning (default: skip)')
 
     args = parser.parse_args()
 
@@ -348,9 +887,11 @@ Examples:
     scan_folders = get_scan_folders(project_type, args.scan_folders)
 
     # Get exclude patterns
-    exclude_patterns = get_exclude_patterns(project_type)
+    exclude_patterns = list(get_exclude_patterns(project_type))
     if args.exclude:
-        exclude_patterns.extend(args.exclude.split(','))
+        # Drop blanks (e.g. a trailing comma), they become '--exclude ""' / '**/' globs
+        extra = (pattern.strip() for pattern in args.exclude.split(','))
+        exclude_patterns.extend(pattern for pattern in extra if pattern.strip('/'))
 
     print(f"\n🚫 Excluding: {', '.join(exclude_patterns[:5])}{'...' if len(exclude_patterns) > 5 else ''}")
 
@@ -361,9 +902,7 @@ Examples:
     scan_paths = build_scan_paths(args.project_path, scan_folders)
 
     # Run security scans
-    run_semgrep(scan_paths, output_dir, exclude_patterns)
-    run_trivy(scan_paths, output_dir, project_type)
-    run_trufflehog(scan_paths, output_dir)
+    asyncio.run(run_all_scans(scan_paths, output_dir, exclude_patterns, project_type, args.cache))
 
     # Save metadata
     save_scan_metadata(output_dir, args.project_path, project_type, scan_folders)
@@ -378,10 +917,14 @@ Examples:
     print(f"   - trivy.json")
     print(f"   - trufflehog.json")
     print(f"   - scan_metadata.json")
-    print("\n🎯 Next step: Generate PDF report with generate_report.py")
+    if not args.report_pdf:
+        print("\n🎯 Next step: Generate PDF report with generate_report.py")
     print("=" * 80)
     print()
 
+    if args.report_pdf:
+        return generate_pdf_report(output_dir, args.report_pdf, args.project_path)
+
     return 0
 
 
@@ -110,15 +110,46 @@ fi
 # Scan 2: Project-specific dependency file (based on detected type)
 echo "   📦 Scanning project dependencies..."
 
+# Dependency CVEs only change when the lockfile or the Trivy DB changes,
+# so reuse the previous result for the same (lockfile hash, DB version)
+TRIVY_PKG_CACHE="$HOME/.cache/tts-security/trivy-pkg"
+
+trivy_pkg_scan() {
+    local target="$1"
+    local output="security-reports/trivy-pkg.json"
+    local db_version key cached
+
+    # Empty until the vulnerability DB has been downloaded (UpdatedAt is null)
+    db_version=$(trivy --version --format json 2>/dev/null | jq -r 'select(.VulnerabilityDB.UpdatedAt != null) | "\(.Version)-\(.VulnerabilityDB.UpdatedAt)"' 2>/dev/null || true)
+    if [ -n "$db_version" ]; then
+        key="$(sha256sum "$target" | cut -d' ' -f1)-$(echo "$db_version" | tr -c 'A-Za-z0-9._\n-' '_')"
+        cached="$TRIVY_PKG_CACHE/trivy-pkg-$key.json"
+        # Cache hit only if the entry is less than 24h old
+        if [ -n "$(find "$cached" -mmin -1440 2>/dev/null)" ] && cp "$cached" "$output" 2>/dev/null; then
+            echo "      💾 Lockfile unchanged, reusing cached result"
+            return 0
+        fi
+    fi
+
+    if trivy fs --format json --severity HIGH,CRITICAL,MEDIUM,LOW "$target" > "$output" 2>/dev/null; then
+        # Best effort, an unwritable $HOME must not fail the scan under set -e
+        if [ -n "$key" ]; then
+            { mkdir -p "$TRIVY_PKG_CACHE" && cp "$output" "$cached.tmp.$$" && mv "$cached.tmp.$$" "$cached"; } 2>/dev/null || true
+        fi
+    else
+        echo '{"Results":[]}' > "$output"
+    fi
+}
+
 case "$PROJECT_TYPE" in
     NODE)
         # Try package-lock.json first, fallback to package.json
         if [ -f "package-lock.json" ]; then
             echo "      🔍 Scanning package-lock.json (Node.js)..."
-            trivy fs --format json --severity HIGH,CRITICAL,MEDIUM,LOW package-lock.json > security-reports/trivy-pkg.json 2>/dev/null || echo '{"Results":[]}' > security-reports/trivy-pkg.json
+            trivy_pkg_scan package-lock.json
         elif [ -f "package.json" ]; then
             echo "      🔍 Scanning package.json (Node.js)..."
-            trivy fs --format json --severity HIGH,CRITICAL,MEDIUM,LOW package.json > security-reports/trivy-pkg.json 2>/dev/null || echo '{"Results":[]}' > security-reports/trivy-pkg.json
+            trivy_pkg_scan package.json
         else
             echo '{"Results":[]}' > security-reports/trivy-pkg.json
         fi
@@ -126,7 +157,7 @@ case "$PROJECT_TYPE" in
     MAVEN)
         if [ -f "pom.xml" ]; then
             echo "      🔍 Scanning pom.xml (Maven)..."
-            trivy fs --format json --severity HIGH,CRITICAL,MEDIUM,LOW pom.xml > security-reports/trivy-pkg.json 2>/dev/null || echo '{"Results":[]}' > security-reports/trivy-pkg.json
+            trivy_pkg_scan pom.xml
         else
             echo '{"Results":[]}' > security-reports/trivy-pkg.json
         fi
@@ -134,10 +165,10 @@ case "$PROJECT_TYPE" in
     GRADLE)
         if [ -f "build.gradle" ]; then
             echo "      🔍 Scanning build.gradle (Gradle)..."
-            trivy fs --format json --severity HIGH,CRITICAL,MEDIUM,LOW build.gradle > security-reports/trivy-pkg.json 2>/dev/null || echo '{"Results":[]}' > security-reports/trivy-pkg.json
+            trivy_pkg_scan build.gradle
         elif [ -f "build.gradle.kts" ]; then
             echo "      🔍 Scanning build.gradle.kts (Gradle Kotlin)..."
-            trivy fs --format json --severity HIGH,CRITICAL,MEDIUM,LOW build.gradle.kts > security-reports/trivy-pkg.json 2>/dev/null || echo '{"Results":[]}' > security-reports/trivy-pkg.json
+            trivy_pkg_scan build.gradle.kts
         else
             echo '{"Results":[]}' > security-reports/trivy-pkg.json
         fi
@@ -145,7 +176,7 @@ case "$PROJECT_TYPE" in
     PYTHON)
         if [ -f "requirements.txt" ]; then
             echo "      🔍 Scanning requirements.txt (Python)..."
-            trivy fs --format json --severity HIGH,CRITICAL,MEDIUM,LOW requirements.txt > security-reports/trivy-pkg.json 2>/dev/null || echo '{"Results":[]}' > security-reports/trivy-pkg.json
+            trivy_pkg_scan requirements.txt
         else
             echo '{"Results":[]}' > security-reports/trivy-pkg.json
         fi
@@ -153,7 +184,7 @@ case "$PROJECT_TYPE" in
     GO)
         if [ -f "go.mod" ]; then
             echo "      🔍 Scanning go.mod (Go)..."
-            trivy fs --format json --severity HIGH,CRITICAL,MEDIUM,LOW go.mod > security-reports/trivy-pkg.json 2>/dev/null || echo '{"Results":[]}' > security-reports/trivy-pkg.json
+            trivy_pkg_scan go.mod
         else
             echo '{"Results":[]}' > security-reports/trivy-pkg.json
         fi
@@ -161,10 +192,10 @@ case "$PROJECT_TYPE" in
     RUBY)
         if [ -f "Gemfile.lock" ]; then
             echo "      🔍 Scanning Gemfile.lock (Ruby)..."
-            trivy fs --format json --severity HIGH,CRITICAL,MEDIUM,LOW Gemfile.lock > security-reports/trivy-pkg.json 2>/dev/null || echo '{"Results":[]}' > security-reports/trivy-pkg.json
+            trivy_pkg_scan Gemfile.lock
         elif [ -f "Gemfile" ]; then
             echo "      🔍 Scanning Gemfile (Ruby)..."
-            trivy fs --format json --severity HIGH,CRITICAL,MEDIUM,LOW Gemfile > security-reports/trivy-pkg.json 2>/dev/null || echo '{"Results":[]}' > security-reports/trivy-pkg.json
+            trivy_pkg_scan Gemfile
         else
             echo '{"Results":[]}' > security-reports/trivy-pkg.json
         fi
@@ -172,10 +203,10 @@ case "$PROJECT_TYPE" in
     PHP)
         if [ -f "composer.lock" ]; then
             echo "      🔍 Scanning composer.lock (PHP)..."
-            trivy fs --format json --severity HIGH,CRITICAL,MEDIUM,LOW composer.lock > security-reports/trivy-pkg.json 2>/dev/null || echo '{"Results":[]}' > security-reports/trivy-pkg.json
+            trivy_pkg_scan composer.lock
         elif [ -f "composer.json" ]; then
             echo "      🔍 Scanning composer.json (PHP)..."
-            trivy fs --format json --severity HIGH,CRITICAL,MEDIUM,LOW composer.json > security-reports/trivy-pkg.json 2>/dev/null || echo '{"Results":[]}' > security-reports/trivy-pkg.json
+            trivy_pkg_scan composer.json
         else
             echo '{"Results":[]}' > security-reports/trivy-pkg.json
         fi